@@ -1,15 +1,23 @@
 #!/usr/bin/env python3
 import argparse
+import concurrent.futures
 import datetime as dt
 import difflib
 import email
+import email.policy
+import functools
+import hashlib
+import heapq
 import imaplib
+import io
 import json
+import mmap
 import os
 import re
-from collections.abc import Iterator
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
 from email.header import decode_header
+from html import unescape
 from html.parser import HTMLParser
 from pathlib import Path
 from typing import Any
@@ -17,6 +25,23 @@ from urllib.parse import parse_qs, quote, urlparse
 
 import requests
 
+try:
+    from rapidfuzz import fuzz as _rf_fuzz
+    from rapidfuzz import process as _rf_process
+except ImportError:  # Optional speedup; difflib path below still works.
+    _rf_fuzz = None
+    _rf_process = None
+
+try:
+    import ahocorasick as _ahocorasick
+except ImportError:  # Optional speedup; per-keyword substring checks still work.
+    _ahocorasick = None
+
+try:
+    import orjson as _orjson
+except ImportError:  # Optional speedup; stdlib json path below still works.
+    _orjson = None
+
 
 @dataclass
 class MatchRule:
@@ -47,8 +72,10 @@ class AnchorParser(HTMLParser):
         super().__init__()
         self.in_a = False
         self.current_href = ""
+        # Reused across anchors (cleared, never rebound) to avoid one list
+        # allocation per tag on anchor-heavy pages.
         self.current_text_chunks: list[str] = []
-        self.anchors: list[dict[str, str]] = []
+        self.anchors: list[tuple[str, str]] = []
 
     def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
         if tag.lower() != "a":
@@ -60,7 +87,7 @@ class AnchorParser(HTMLParser):
                 break
         self.in_a = True
         self.current_href = href
-        self.current_text_chunks = []
+        self.current_text_chunks.clear()
 
     def handle_data(self, data: str) -> None:
         if self.in_a:
@@ -71,10 +98,10 @@ class AnchorParser(HTMLParser):
             return
         text = "".join(self.current_text_chunks).strip()
         if self.current_href:
-            self.anchors.append({"url": self.current_href.strip(), "text": text})
+            self.anchors.append((self.current_href.strip(), text))
         self.in_a = False
         self.current_href = ""
-        self.current_text_chunks = []
+        self.current_text_chunks.clear()
 
 
 class ScriptParser(HTMLParser):
@@ -151,10 +178,36 @@ def load_rules(path: Path) -> MatchRule:
     )
 
 
+_NORM_RE = re.compile(r"[^0-9a-z\u4e00-\u9fff]+")
+_TOKEN_RE = re.compile(r"[a-z0-9+#._/-]+")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_ANCHOR_RE = re.compile(
+    r"<a\b[^>]*href\s*=\s*(?:\"([^\"]*)\"|'([^']*)')[^>]*>(.*?)</a>",
+    re.IGNORECASE | re.DOTALL,
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+_URL_RE = re.compile(r"https?://[^\s<>\"]+")
+_104_URL_MARKERS = ("104.com.tw/job", "104.com.tw/jobs")
+
+# One shared session so repeated calls against the same host reuse the
+# TCP/TLS connection instead of paying a fresh handshake per request.
+_SESSION = requests.Session()
+
+
+# Deletion table equivalent to _NORM_RE for pure-ASCII input.
+_ASCII_DROP = str.maketrans(
+    "", "", "".join(chr(c) for c in range(128) if not ("0" <= chr(c) <= "9" or "a" <= chr(c) <= "z"))
+)
+
+
 def _normalize_text_for_match(text: str) -> str:
     lowered = text.lower()
     # Keep CJK and alnum, drop most separators to make "road map" ~= "roadmap".
-    return re.sub(r"[^0-9a-z\u4e00-\u9fff]+", "", lowered)
+    if lowered.isascii():
+        # str.translate walks a C deletion table, noticeably faster than
+        # the character-class regex on English-dominant descriptions.
+        return lowered.translate(_ASCII_DROP)
+    return _NORM_RE.sub("", lowered)
 
 
 def normalize_city_name(text: str) -> str:
@@ -162,45 +215,288 @@ def normalize_city_name(text: str) -> str:
     return (text or "").strip().replace("臺", "台")
 
 
-def keyword_in_text(text: str, keyword: str, fuzzy: bool, threshold: float) -> bool:
-    if not keyword:
-        return False
-    text_l = text.lower()
+@dataclass
+class JobText:
+    """Per-job text views computed once and shared across keyword checks."""
+
+    text_l: str
+    text_n: str
+    tokens_n: tuple[str, ...]
+    words: tuple[str, ...]
+    word_count: int
+    # Lazy cache of "".join(words[i:i+k]) windows, keyed by window size and
+    # the first character the window must start with.
+    gram_cache: dict[tuple[int, str], list[str]] = field(default_factory=dict)
+
+
+@dataclass
+class CompiledKeyword:
+    """Per-keyword normalization computed once at rule load time."""
+
+    raw: str
+    kw_l: str
+    kw_n: str
+    words: tuple[str, ...]
+    target: str
+    word_count: int
+    # Reason strings preformatted once here so the per-job hit paths append
+    # constants instead of running an f-string per match.
+    hit_reason: str = ""
+    exclude_reason: str = ""
+
+
+@dataclass
+class CompiledRule:
+    rules: MatchRule
+    exclude_keywords: list[CompiledKeyword]
+    include_keywords: list[CompiledKeyword]
+    title_include_keywords: list[CompiledKeyword]
+    required_keyword_groups: list[list[CompiledKeyword]]
+    include_industry_keywords: list[CompiledKeyword]
+    # Aho-Corasick automatons over every exact pattern (kw_l on text_l and
+    # kw_n on text_n); None when pyahocorasick is unavailable.
+    exact_automaton_l: Any = None
+    exact_automaton_n: Any = None
+    # Separate automatons for the title-only gate, which scans the title
+    # text rather than the full job text.
+    title_automaton_l: Any = None
+    title_automaton_n: Any = None
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_keyword(keyword: str) -> CompiledKeyword:
     kw_l = keyword.lower()
+    words = tuple(_WORD_RE.findall(kw_l))
+    return CompiledKeyword(
+        raw=keyword,
+        kw_l=kw_l,
+        kw_n=_normalize_text_for_match(keyword),
+        words=words,
+        target="".join(words),
+        word_count=len(words),
+        hit_reason=f"關鍵字符合: {keyword}",
+        exclude_reason=f"排除關鍵字: {keyword}",
+    )
+
+
+def compile_rules(rules: MatchRule) -> CompiledRule:
+    required_groups = rules.required_keyword_groups
+    if not required_groups:
+        required_groups = [[kw] for kw in rules.required_keywords_all]
+    compiled = CompiledRule(
+        rules=rules,
+        exclude_keywords=[compile_keyword(kw) for kw in rules.exclude_keywords],
+        include_keywords=[compile_keyword(kw) for kw in rules.include_keywords],
+        title_include_keywords=[
+            compile_keyword(kw) for kw in rules.title_include_keywords
+        ],
+        required_keyword_groups=[
+            [compile_keyword(term) for term in group] for group in required_groups
+        ],
+        include_industry_keywords=[
+            compile_keyword(kw) for kw in rules.include_industry_keywords
+        ],
+    )
+    fulltext_cks = (
+        compiled.exclude_keywords
+        + compiled.include_keywords
+        + [ck for group in compiled.required_keyword_groups for ck in group]
+        + compiled.include_industry_keywords
+    )
+    compiled.exact_automaton_l, compiled.exact_automaton_n = _build_exact_automatons(
+        fulltext_cks
+    )
+    compiled.title_automaton_l, compiled.title_automaton_n = _build_exact_automatons(
+        compiled.title_include_keywords
+    )
+    return compiled
+
+
+def _build_exact_automatons(cks: list[CompiledKeyword]) -> tuple[Any, Any]:
+    """Build one automaton per text view so each job is scanned once, not
+    once per keyword. Each pattern maps back to every kw_l it proves:
+    distinct keywords can share a normalized form ("roadmap" / "road map"
+    both normalize to "roadmap"), and add_word overwrites on duplicate
+    patterns, so the values must be collected per pattern first."""
+    if _ahocorasick is None:
+        return None, None
+    patterns_l: dict[str, set[str]] = {}
+    patterns_n: dict[str, set[str]] = {}
+    for ck in cks:
+        if ck.kw_l:
+            patterns_l.setdefault(ck.kw_l, set()).add(ck.kw_l)
+        if ck.kw_n:
+            patterns_n.setdefault(ck.kw_n, set()).add(ck.kw_l)
+    if not patterns_l:
+        return None, None
+    auto_l = _ahocorasick.Automaton()
+    for pattern, kws in patterns_l.items():
+        auto_l.add_word(pattern, tuple(kws))
+    auto_l.make_automaton()
+    auto_n = None
+    if patterns_n:
+        auto_n = _ahocorasick.Automaton()
+        for pattern, kws in patterns_n.items():
+            auto_n.add_word(pattern, tuple(kws))
+        auto_n.make_automaton()
+    return auto_l, auto_n
+
+
+def _automaton_hits(auto_l: Any, auto_n: Any, jt: JobText) -> set[str] | None:
+    """One linear scan of a text view for every exact pattern at once.
+
+    Returns the set of kw_l values with an exact (lowered or normalized)
+    substring occurrence, or None when no automaton is available and the
+    caller must fall back to per-keyword checks.
+    """
+    if auto_l is None:
+        return None
+    hits: set[str] = set()
+    for _, kws in auto_l.iter(jt.text_l):
+        hits.update(kws)
+    if auto_n is not None and jt.text_n:
+        for _, kws in auto_n.iter(jt.text_n):
+            hits.update(kws)
+    return hits
+
+
+def exact_keyword_hits(compiled: CompiledRule, jt: JobText) -> set[str] | None:
+    return _automaton_hits(compiled.exact_automaton_l, compiled.exact_automaton_n, jt)
+
+
+def title_keyword_hits(compiled: CompiledRule, jt: JobText) -> set[str] | None:
+    return _automaton_hits(compiled.title_automaton_l, compiled.title_automaton_n, jt)
+
+
+def prepare_job_text(text: str, text_n: str | None = None) -> JobText:
+    text_l = text.lower()
+    if text_n is None:
+        text_n = _normalize_text_for_match(text_l)
+    tokens_n = tuple(
+        token_n
+        for token_n in (
+            _normalize_text_for_match(token) for token in _TOKEN_RE.findall(text_l)
+        )
+        if token_n
+    )
+    words = tuple(_WORD_RE.findall(text_l))
+    return JobText(
+        text_l=text_l,
+        text_n=text_n,
+        tokens_n=tokens_n,
+        words=words,
+        word_count=len(words),
+    )
+
 
-    if kw_l in text_l:
+def exact_keyword_in_prepared(jt: JobText, ck: CompiledKeyword) -> bool:
+    if not ck.kw_l:
+        return False
+    if ck.kw_l in jt.text_l:
         return True
+    return bool(ck.kw_n) and ck.kw_n in jt.text_n
 
-    text_n = _normalize_text_for_match(text)
-    kw_n = _normalize_text_for_match(keyword)
-    if kw_n and kw_n in text_n:
+
+def keyword_in_prepared(
+    jt: JobText, ck: CompiledKeyword, fuzzy: bool, threshold: float
+) -> bool:
+    if exact_keyword_in_prepared(jt, ck):
         return True
-    if not fuzzy or not kw_n:
+    if not fuzzy or not ck.kw_l:
+        return False
+    return fuzzy_keyword_in_prepared(jt, ck, threshold)
+
+
+# Jobs from the same company often share boilerplate descriptions, so the
+# same (text, keyword) fuzzy decision can repeat across a batch. Bounded
+# per-run cache; cleared in main once scoring is done.
+_FUZZY_CACHE: dict[tuple[str, str, int], bool] = {}
+_FUZZY_CACHE_MAX = 100_000
+
+
+def _fuzzy_hit_cached(jt: JobText, ck: CompiledKeyword, threshold: float) -> bool:
+    key = (jt.text_l, ck.kw_l, int(threshold * 100))
+    hit = _FUZZY_CACHE.get(key)
+    if hit is None:
+        hit = fuzzy_keyword_in_prepared(jt, ck, threshold)
+        if len(_FUZZY_CACHE) < _FUZZY_CACHE_MAX:
+            _FUZZY_CACHE[key] = hit
+    return hit
+
+
+def fuzzy_keyword_in_prepared(jt: JobText, ck: CompiledKeyword, threshold: float) -> bool:
+    if not ck.kw_n:
+        return False
+    # Keywords this short cannot miss by a meaningful edit distance;
+    # fuzzy matching them only produces noise.
+    if len(ck.kw_n) < 4:
         return False
 
     # Token-level fuzzy matching for English-like terms.
-    text_tokens = re.findall(r"[a-z0-9+#._/-]+", text_l)
-    for token in text_tokens:
-        token_n = _normalize_text_for_match(token)
-        if not token_n:
-            continue
-        if difflib.SequenceMatcher(None, token_n, kw_n).ratio() >= threshold:
+    if _fuzzy_any(ck.kw_n, jt.tokens_n, threshold):
+        return True
+
+    # N-gram fuzzy matching for multi-word keywords. Only scan the windows
+    # when at least one keyword word appears verbatim; a window can't clear
+    # the ratio threshold otherwise.
+    if (
+        ck.word_count >= 2
+        and jt.word_count >= ck.word_count
+        and any(w in jt.text_l for w in ck.words)
+    ):
+        k = ck.word_count
+        # Lucene-style skip: a window whose first word doesn't even share the
+        # keyword's starting character can't clear the ratio threshold, so
+        # don't pay for joining it.
+        first_char = ck.target[0]
+        cache_key = (k, first_char)
+        grams = jt.gram_cache.get(cache_key)
+        if grams is None:
+            grams = [
+                "".join(jt.words[i : i + k])
+                for i in range(0, jt.word_count - k + 1)
+                if jt.words[i].startswith(first_char)
+            ]
+            jt.gram_cache[cache_key] = grams
+        if _fuzzy_any(ck.target, grams, threshold):
             return True
 
-    # N-gram fuzzy matching for multi-word keywords.
-    kw_words = re.findall(r"[a-z0-9]+", kw_l)
-    words = re.findall(r"[a-z0-9]+", text_l)
-    if len(kw_words) >= 2 and len(words) >= len(kw_words):
-        k = len(kw_words)
-        target = "".join(kw_words)
-        for i in range(0, len(words) - k + 1):
-            gram = "".join(words[i : i + k])
-            if difflib.SequenceMatcher(None, gram, target).ratio() >= threshold:
-                return True
+    return False
+
 
+def _fuzzy_any(needle: str, candidates: Sequence[str], threshold: float) -> bool:
+    if not candidates:
+        return False
+    if _rf_process is not None:
+        # rapidfuzz scores on a 0-100 scale and early-exits on score_cutoff.
+        return (
+            _rf_process.extractOne(
+                needle,
+                candidates,
+                scorer=_rf_fuzz.ratio,
+                score_cutoff=threshold * 100,
+            )
+            is not None
+        )
+    for candidate in candidates:
+        sm = difflib.SequenceMatcher(None, candidate, needle)
+        # Cheap length/multiset upper bounds first; the full quadratic
+        # ratio() only runs when the bounds can still clear the threshold.
+        if (
+            sm.real_quick_ratio() >= threshold
+            and sm.quick_ratio() >= threshold
+            and sm.ratio() >= threshold
+        ):
+            return True
     return False
 
 
+def keyword_in_text(text: str, keyword: str, fuzzy: bool, threshold: float) -> bool:
+    return keyword_in_prepared(
+        prepare_job_text(text), compile_keyword(keyword), fuzzy, threshold
+    )
+
+
 def normalize_job(job: dict[str, Any], source: str = "unknown") -> dict[str, Any]:
     title = job.get("jobName") or job.get("title") or ""
     company = job.get("custName") or job.get("companyName") or ""
@@ -238,7 +534,7 @@ def normalize_job(job: dict[str, Any], source: str = "unknown") -> dict[str, Any
     if isinstance(tags, str):
         tags = [tags]
     remote = bool(job.get("remote", False))
-    return {
+    normalized = {
         "title": str(title),
         "company": str(company),
         "city": str(city),
@@ -251,6 +547,23 @@ def normalize_job(job: dict[str, Any], source: str = "unknown") -> dict[str, Any
         "source": source,
         "source_raw": job,
     }
+    # Amortize the lowering/normalization here so score_job never re-lowers
+    # the same fields; this is the one-time canonicalization pass anyway.
+    text_l = " ".join(
+        [
+            normalized["title"].lower(),
+            normalized["company"].lower(),
+            normalized["city"].lower(),
+            normalized["industry"].lower(),
+            normalized["description"].lower(),
+            " ".join(t.lower() for t in normalized["tags"]),
+        ]
+    )
+    normalized["_text_l"] = text_l
+    normalized["_text_n"] = _NORM_RE.sub("", text_l)
+    normalized["_company_l"] = normalized["company"].lower()
+    normalized["_title_l"] = normalized["title"].lower()
+    return normalized
 
 
 def decode_mime_words(value: str | None) -> str:
@@ -267,6 +580,20 @@ def decode_mime_words(value: str | None) -> str:
 
 
 def extract_email_bodies(msg: email.message.Message) -> tuple[str, str]:
+    # Messages parsed with the modern policy expose get_body/get_content,
+    # which pick the best part and decode in one call instead of walking
+    # and re-decoding every leaf.
+    if isinstance(msg, email.message.EmailMessage):
+        try:
+            plain_part = msg.get_body(preferencelist=("plain",))
+            html_part = msg.get_body(preferencelist=("html",))
+            return (
+                plain_part.get_content() if plain_part is not None else "",
+                html_part.get_content() if html_part is not None else "",
+            )
+        except Exception:
+            # Broken charsets etc.; fall back to the tolerant walk below.
+            pass
     plain_parts: list[str] = []
     html_parts: list[str] = []
     if msg.is_multipart():
@@ -298,19 +625,21 @@ def extract_jobs_from_email(
 ) -> list[dict[str, Any]]:
     jobs: list[dict[str, Any]] = []
     seen_urls: set[str] = set()
-    parser = AnchorParser()
-    if html_text:
-        parser.feed(html_text)
-    for anchor in parser.anchors:
-        url = anchor["url"]
+    # A compiled regex pass beats the event-driven HTMLParser state machine
+    # for the simple job of pulling <a href> pairs out of marketing emails.
+    for match in _ANCHOR_RE.finditer(html_text or ""):
+        # HTMLParser unescaped attribute values; the regex sees the raw
+        # markup, so hrefs like ...&amp;utm_source=x need the same treatment.
+        url = unescape(match.group(1) or match.group(2) or "").strip()
         if not url.startswith("http"):
             continue
-        if "104.com.tw/job" not in url and "104.com.tw/jobs" not in url:
+        if not any(marker in url for marker in _104_URL_MARKERS):
             continue
         if url in seen_urls:
             continue
         seen_urls.add(url)
-        title = anchor["text"] or subject
+        text = unescape(_TAG_RE.sub("", match.group(3))).strip()
+        title = text or subject
         jobs.append(
             {
                 "title": title,
@@ -325,10 +654,9 @@ def extract_jobs_from_email(
             }
         )
 
-    url_pattern = r"https?://[^\s<>\"]+"
-    for url in re.findall(url_pattern, plain_text):
+    for url in _URL_RE.findall(plain_text):
         cleaned = url.strip(").,")
-        if "104.com.tw/job" not in cleaned and "104.com.tw/jobs" not in cleaned:
+        if not any(marker in cleaned for marker in _104_URL_MARKERS):
             continue
         if cleaned in seen_urls:
             continue
@@ -349,86 +677,102 @@ def extract_jobs_from_email(
     return jobs
 
 
-def score_job(job: dict[str, Any], rules: MatchRule) -> tuple[int, list[str]]:
-    score = 0
-    reasons: list[str] = []
-    company_lower = job["company"].lower()
-    title_text = job["title"].lower()
-    fulltext = " ".join(
-        [
-            title_text,
-            job["company"].lower(),
-            job["city"].lower(),
-            job.get("industry", "").lower(),
-            job["description"].lower(),
-            " ".join(t.lower() for t in job["tags"]),
-        ]
-    )
+def cheap_disqualify_reason(job: dict[str, Any], rules: MatchRule) -> str | None:
+    """Scalar disqualifiers that need no keyword scanning.
 
-    for kw in rules.exclude_keywords:
-        if keyword_in_text(
-            fulltext, kw, rules.fuzzy_match_enabled, rules.fuzzy_match_threshold
-        ):
-            return -9999, [f"排除關鍵字: {kw}"]
+    Evaluated as a pre-filter over the whole batch so jobs that fail the
+    city / company checks never pay for the keyword and fuzzy scans.
+    """
+    if rules.allowed_cities and job["city"]:
+        city = normalize_city_name(job["city"])
+        city_allowed = any(
+            (allowed := normalize_city_name(allowed_raw))
+            and (allowed in city)
+            for allowed_raw in rules.allowed_cities
+        )
+        if not city_allowed:
+            return f"不在允許城市: {job['city']}"
+    company_lower = job.get("_company_l") or job["company"].lower()
+    for c in rules.exclude_companies:
+        if c.lower() in company_lower:
+            return f"排除公司: {c}"
+    return None
 
-    if rules.require_title_include_keyword_match and rules.title_include_keywords:
-        title_hit = any(
-            keyword_in_text(
+
+def score_job(job: dict[str, Any], compiled: CompiledRule) -> tuple[int, list[str]]:
+    rules = compiled.rules
+    # Cheapest disqualifiers first: a job outside the allowed cities or from
+    # an excluded company never pays for the keyword and fuzzy scans below.
+    cheap_reason = cheap_disqualify_reason(job, rules)
+    if cheap_reason:
+        return -9999, [cheap_reason]
+    score = 0
+    reasons: list[str] = []
+    company_lower = job.get("_company_l") or job["company"].lower()
+    title_text = job.get("_title_l") or job["title"].lower()
+    fulltext = job.get("_text_l")
+    if fulltext is None:
+        # Jobs that didn't pass through normalize_job (e.g. merge inputs).
+        fulltext = " ".join(
+            [
                 title_text,
-                kw,
-                False,
-                rules.fuzzy_match_threshold,
-            )
-            for kw in rules.title_include_keywords
+                job["company"].lower(),
+                job["city"].lower(),
+                job.get("industry", "").lower(),
+                job["description"].lower(),
+                " ".join(t.lower() for t in job["tags"]),
+            ]
+        )
+    jt = prepare_job_text(fulltext, job.get("_text_n"))
+    exact_hits = exact_keyword_hits(compiled, jt)
+
+    def kw_hit(ck: CompiledKeyword, fuzzy: bool) -> bool:
+        return _keyword_hit(jt, exact_hits, ck, fuzzy, rules.fuzzy_match_threshold)
+
+    # Exact pass over all excludes first; the fuzzy pass only runs when no
+    # exclude matched exactly.
+    for ck in compiled.exclude_keywords:
+        if _keyword_exact(jt, exact_hits, ck):
+            return -9999, [ck.exclude_reason]
+    if rules.fuzzy_match_enabled:
+        for ck in compiled.exclude_keywords:
+            if _fuzzy_hit_cached(jt, ck, rules.fuzzy_match_threshold):
+                return -9999, [ck.exclude_reason]
+
+    if rules.require_title_include_keyword_match and compiled.title_include_keywords:
+        title_jt = prepare_job_text(title_text)
+        title_hits = title_keyword_hits(compiled, title_jt)
+        title_hit = any(
+            _keyword_exact(title_jt, title_hits, ck)
+            for ck in compiled.title_include_keywords
         )
         if not title_hit:
             return -9999, ["職稱非目標 PM 類型"]
 
-    required_groups = rules.required_keyword_groups
-    if not required_groups:
-        required_groups = [[kw] for kw in rules.required_keywords_all]
-    if required_groups:
+    if compiled.required_keyword_groups:
         group_hits = 0
         missing_groups: list[str] = []
-        for group in required_groups:
+        for group in compiled.required_keyword_groups:
             if not group:
                 continue
-            if any(
-                keyword_in_text(
-                    fulltext,
-                    term,
-                    rules.fuzzy_match_enabled,
-                    rules.fuzzy_match_threshold,
-                )
-                for term in group
-            ):
+            if any(kw_hit(ck, rules.fuzzy_match_enabled) for ck in group):
                 group_hits += 1
             else:
-                missing_groups.append(" / ".join(group))
-        required_hits = rules.min_required_group_matches or len(required_groups)
+                missing_groups.append(" / ".join(ck.raw for ck in group))
+        required_hits = rules.min_required_group_matches or len(
+            compiled.required_keyword_groups
+        )
         if group_hits < required_hits:
             return -9999, [f"必要群組命中不足: {group_hits}/{required_hits}"]
 
-    if rules.allowed_cities and job["city"]:
-        city = normalize_city_name(job["city"])
-        city_allowed = any(
-            (allowed := normalize_city_name(allowed_raw))
-            and (allowed in city)
-            for allowed_raw in rules.allowed_cities
-        )
-        if not city_allowed:
-            return -9999, [f"不在允許城市: {job['city']}"]
-
-    for c in rules.exclude_companies:
-        if c.lower() in company_lower:
-            return -9999, [f"排除公司: {c}"]
-
-    if rules.include_industry_keywords:
+    if compiled.include_industry_keywords:
         industry_text = job.get("industry", "").lower()
-        industry_hit = any(kw.lower() in industry_text for kw in rules.include_industry_keywords)
+        industry_hit = any(
+            ck.kw_l in industry_text for ck in compiled.include_industry_keywords
+        )
         industry_loose_hit = any(
-            kw.lower() in industry_text or kw.lower() in fulltext
-            for kw in rules.include_industry_keywords
+            ck.kw_l in industry_text or ck.kw_l in jt.text_l
+            for ck in compiled.include_industry_keywords
         )
         if rules.require_industry_match and not industry_hit:
             return -9999, ["非目標產業（軟體優先）"]
@@ -437,13 +781,11 @@ def score_job(job: dict[str, Any], rules: MatchRule) -> tuple[int, list[str]]:
             reasons.append(f"產業符合: {job.get('industry', '') or '軟體相關關鍵字'}")
 
     include_hit = 0
-    for kw in rules.include_keywords:
-        if keyword_in_text(
-            fulltext, kw, rules.fuzzy_match_enabled, rules.fuzzy_match_threshold
-        ):
+    for ck in compiled.include_keywords:
+        if kw_hit(ck, rules.fuzzy_match_enabled):
             include_hit += 1
             score += 10
-            reasons.append(f"關鍵字符合: {kw}")
+            reasons.append(ck.hit_reason)
 
     if rules.require_include_keyword_match and include_hit == 0:
         return -9999, ["未命中任何 include_keywords"]
@@ -484,6 +826,224 @@ def score_job(job: dict[str, Any], rules: MatchRule) -> tuple[int, list[str]]:
     return score, reasons
 
 
+def _keyword_exact(
+    jt: JobText, exact_hits: set[str] | None, ck: CompiledKeyword
+) -> bool:
+    if exact_hits is not None:
+        return ck.kw_l in exact_hits
+    return exact_keyword_in_prepared(jt, ck)
+
+
+def _keyword_hit(
+    jt: JobText,
+    exact_hits: set[str] | None,
+    ck: CompiledKeyword,
+    fuzzy: bool,
+    threshold: float,
+) -> bool:
+    if _keyword_exact(jt, exact_hits, ck):
+        return True
+    if not fuzzy or not ck.kw_l:
+        return False
+    return _fuzzy_hit_cached(jt, ck, threshold)
+
+
+def compile_scorer(rules: MatchRule) -> Any:
+    """Generate a scorer function specialized to one rule file.
+
+    The rule structure is fixed for a whole run, so the keyword loops are
+    unrolled into generated source with the reason strings embedded as
+    literals and unused feature branches dropped. Semantics match
+    score_job; the generated function only skips the interpreter overhead
+    of iterating rule lists per job.
+    """
+    compiled = compile_rules(rules)
+    fz = repr(bool(rules.fuzzy_match_enabled))
+    th = repr(rules.fuzzy_match_threshold)
+    ns: dict[str, Any] = {
+        "_rules": rules,
+        "_compiled": compiled,
+        "_score_job": score_job,
+        "_prepare": prepare_job_text,
+        "_exact_hits": exact_keyword_hits,
+        "_title_hits": title_keyword_hits,
+        "_hit": _keyword_hit,
+        "_kx": _keyword_exact,
+        "_kf": _fuzzy_hit_cached,
+        "_cheap": cheap_disqualify_reason,
+        "_norm_city": normalize_city_name,
+    }
+    src: list[str] = [
+        "def _scorer(job):",
+        "    fulltext = job.get('_text_l')",
+        "    if fulltext is None:",
+        "        return _score_job(job, _compiled)",
+    ]
+    if rules.allowed_cities or rules.exclude_companies:
+        src.append("    cheap_reason = _cheap(job, _rules)")
+        src.append("    if cheap_reason:")
+        src.append("        return -9999, [cheap_reason]")
+    src += [
+        "    score = 0",
+        "    reasons = []",
+        "    jt = _prepare(fulltext, job.get('_text_n'))",
+        "    hits = _exact_hits(_compiled, jt)",
+    ]
+
+    # Exact pass over all excludes first, fuzzy pass only on full miss.
+    for i, ck in enumerate(compiled.exclude_keywords):
+        ns[f"_ex{i}"] = ck
+        src.append(f"    if _kx(jt, hits, _ex{i}):")
+        src.append(f"        return -9999, [{f'排除關鍵字: {ck.raw}'!r}]")
+    if rules.fuzzy_match_enabled:
+        for i, ck in enumerate(compiled.exclude_keywords):
+            src.append(f"    if _kf(jt, _ex{i}, {th}):")
+            src.append(f"        return -9999, [{f'排除關鍵字: {ck.raw}'!r}]")
+
+    if rules.require_title_include_keyword_match and compiled.title_include_keywords:
+        for i, ck in enumerate(compiled.title_include_keywords):
+            ns[f"_ti{i}"] = ck
+        checks = " or ".join(
+            f"_kx(title_jt, title_hits, _ti{i})"
+            for i in range(len(compiled.title_include_keywords))
+        )
+        src.append(
+            "    title_jt = _prepare(job.get('_title_l') or job['title'].lower())"
+        )
+        src.append("    title_hits = _title_hits(_compiled, title_jt)")
+        src.append(f"    if not ({checks}):")
+        src.append("        return -9999, ['職稱非目標 PM 類型']")
+
+    groups = [g for g in compiled.required_keyword_groups if g]
+    if groups:
+        required_hits = rules.min_required_group_matches or len(
+            compiled.required_keyword_groups
+        )
+        src.append("    group_hits = 0")
+        for gi, group in enumerate(groups):
+            for ki, ck in enumerate(group):
+                ns[f"_g{gi}_{ki}"] = ck
+            checks = " or ".join(
+                f"_hit(jt, hits, _g{gi}_{ki}, {fz}, {th})" for ki in range(len(group))
+            )
+            src.append(f"    if {checks}:")
+            src.append("        group_hits += 1")
+        src.append(f"    if group_hits < {required_hits}:")
+        src.append(
+            f"        return -9999, [f'必要群組命中不足: {{group_hits}}/{required_hits}']"
+        )
+
+    if compiled.include_industry_keywords:
+        for i, ck in enumerate(compiled.include_industry_keywords):
+            ns[f"_in{i}"] = ck
+        rng = range(len(compiled.include_industry_keywords))
+        src.append("    industry_text = job.get('industry', '').lower()")
+        hit_checks = " or ".join(f"(_in{i}.kw_l in industry_text)" for i in rng)
+        src.append(f"    industry_hit = {hit_checks}")
+        if rules.require_industry_match:
+            src.append("    if not industry_hit:")
+            src.append("        return -9999, ['非目標產業（軟體優先）']")
+        loose_checks = " or ".join(f"(_in{i}.kw_l in jt.text_l)" for i in rng)
+        src.append(f"    if industry_hit or {loose_checks}:")
+        src.append("        score += 8")
+        src.append(
+            "        reasons.append(f\"產業符合: {job.get('industry', '') or '軟體相關關鍵字'}\")"
+        )
+
+    need_include_count = bool(rules.require_include_keyword_match)
+    if need_include_count:
+        src.append("    include_hit = 0")
+    for i, ck in enumerate(compiled.include_keywords):
+        ns[f"_ic{i}"] = ck
+        src.append(f"    if _hit(jt, hits, _ic{i}, {fz}, {th}):")
+        if need_include_count:
+            src.append("        include_hit += 1")
+        src.append("        score += 10")
+        src.append(f"        reasons.append({f'關鍵字符合: {ck.raw}'!r})")
+    if need_include_count:
+        src.append("    if include_hit == 0:")
+        src.append("        return -9999, ['未命中任何 include_keywords']")
+
+    if rules.include_companies:
+        src.append("    company_lower = job.get('_company_l') or job['company'].lower()")
+        for c in rules.include_companies:
+            src.append(f"    if {c.lower()!r} in company_lower:")
+            src.append("        score += 8")
+            src.append(f"        reasons.append({f'偏好公司: {c}'!r})")
+
+    preferred = [
+        normalized
+        for preferred_raw in rules.preferred_cities
+        if (normalized := normalize_city_name(preferred_raw))
+    ]
+    if preferred:
+        checks = " or ".join(f"({p!r} in city)" for p in preferred)
+        src.append("    if job['city']:")
+        src.append("        city = _norm_city(job['city'])")
+        src.append(f"        if {checks}:")
+        src.append("            score += 6")
+        src.append("            reasons.append(f\"地點符合: {job['city']}\")")
+
+    src.append("    salary = job['salary']")
+    src.append("    if salary <= 0:")
+    src.append("        reasons.append('薪資未知')")
+    src.append(f"    elif salary >= {int(rules.minimum_salary)}:")
+    src.append("        score += 6")
+    src.append(f"        reasons.append({f'薪資符合: >= {rules.minimum_salary}'!r})")
+    src.append("    else:")
+    src.append("        score -= 4")
+    src.append("        reasons.append(f'薪資偏低: {salary}')")
+
+    if rules.require_remote:
+        src.append("    if job['remote']:")
+        src.append("        score += 5")
+        src.append("        reasons.append('支援遠端')")
+        src.append("    else:")
+        src.append("        score -= 8")
+        src.append("        reasons.append('不支援遠端')")
+
+    src.append("    return score, reasons")
+    exec(compile("\n".join(src), "<scorer>", "exec"), ns)
+    return ns["_scorer"]
+
+
+# Scoring is independent per job; above this batch size the pool startup
+# cost is amortized and scoring fans out across cores.
+_PROCESS_POOL_MIN_JOBS = 200
+
+_WORKER_SCORER: Any = None
+
+
+def _init_score_worker(rules: MatchRule) -> None:
+    # MatchRule pickles cleanly; the automatons and the generated scorer
+    # don't, so each worker compiles its own copy once.
+    global _WORKER_SCORER
+    _WORKER_SCORER = compile_scorer(rules)
+
+
+def _score_one(job: dict[str, Any]) -> tuple[int, list[str]]:
+    if _WORKER_SCORER is None:
+        raise RuntimeError("score worker 未初始化")
+    return _WORKER_SCORER(job)
+
+
+def score_jobs(
+    jobs: list[dict[str, Any]], rules: MatchRule, scorer: Any
+) -> list[tuple[int, list[str]]]:
+    if len(jobs) > _PROCESS_POOL_MIN_JOBS:
+        workers = os.cpu_count() or 1
+        # ~4 chunks per worker balances the pickling overhead of tiny chunks
+        # against the straggler effect of giant ones.
+        chunksize = max(1, len(jobs) // (4 * workers))
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_score_worker,
+            initargs=(rules,),
+        ) as executor:
+            return list(executor.map(_score_one, jobs, chunksize=chunksize))
+    return [scorer(job) for job in jobs]
+
+
 def fetch_jobs() -> list[dict[str, Any]]:
     api_url = os.getenv("JOB_API_URL", "").strip()
     token = os.getenv("JOB_API_TOKEN", "").strip()
@@ -501,7 +1061,7 @@ def fetch_jobs() -> list[dict[str, Any]]:
     if query:
         params["keyword"] = query
 
-    resp = requests.get(api_url, headers=headers, params=params, timeout=timeout)
+    resp = _SESSION.get(api_url, headers=headers, params=params, timeout=timeout)
     resp.raise_for_status()
     data = resp.json()
 
@@ -552,30 +1112,42 @@ def fetch_jobs_from_104_web() -> list[dict[str, Any]]:
         "Referer": "https://www.104.com.tw/jobs/search/",
         "Accept": "application/json, text/plain, */*",
     }
+    def fetch_page(order: str, keyword: str, page: int) -> list[Any]:
+        params = {
+            "keyword": keyword,
+            "area": area,
+            "page": str(page),
+            "order": order,
+            "asc": asc,
+            "mode": "s",
+            "jobsource": "2018indexpoc",
+        }
+        resp = _SESSION.get(url, headers=headers, params=params, timeout=timeout)
+        resp.raise_for_status()
+        data = resp.json().get("data", [])
+        return data if isinstance(data, list) else []
+
+    # The page fetches are RTT-bound; issue each keyword's pages together
+    # and keep consuming them in page order so the empty-page stop and the
+    # resulting job order match the serial behavior.
     jobs: list[dict[str, Any]] = []
-    for order in orders:
-        for keyword in keywords:
-            for page in range(1, max(1, pages) + 1):
-                params = {
-                    "keyword": keyword,
-                    "area": area,
-                    "page": str(page),
-                    "order": order,
-                    "asc": asc,
-                    "mode": "s",
-                    "jobsource": "2018indexpoc",
-                }
-                resp = requests.get(url, headers=headers, params=params, timeout=timeout)
-                resp.raise_for_status()
-                data = resp.json().get("data", [])
-                if not isinstance(data, list) or not data:
-                    break
-                for item in data:
-                    if not isinstance(item, dict):
-                        continue
-                    item_copy = dict(item)
-                    item_copy["_web104_order"] = order
-                    jobs.append(item_copy)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        for order in orders:
+            for keyword in keywords:
+                futures = [
+                    executor.submit(fetch_page, order, keyword, page)
+                    for page in range(1, max(1, pages) + 1)
+                ]
+                for future in futures:
+                    data = future.result()
+                    if not data:
+                        break
+                    for item in data:
+                        if not isinstance(item, dict):
+                            continue
+                        item_copy = dict(item)
+                        item_copy["_web104_order"] = order
+                        jobs.append(item_copy)
     return jobs
 
 
@@ -813,9 +1385,8 @@ def _extract_cake_jobs_from_anchors(html: str, base_url: str) -> list[dict[str,
     parser.feed(html)
     jobs: list[dict[str, Any]] = []
     seen: set[str] = set()
-    for anchor in parser.anchors:
-        href = anchor.get("url", "")
-        text = anchor.get("text", "").strip()
+    for href, text in parser.anchors:
+        text = text.strip()
         if not href:
             continue
         url = _to_absolute_url(href, base_url)
@@ -891,7 +1462,7 @@ def _enrich_cake_jobs_with_detail(
             enriched.append(job)
             continue
         try:
-            resp = requests.get(detail_url, headers=headers, timeout=timeout)
+            resp = _SESSION.get(detail_url, headers=headers, timeout=timeout)
             resp.raise_for_status()
             detail_job = _extract_cake_job_from_detail_html(resp.text, base_url)
         except requests.RequestException:
@@ -1058,7 +1629,7 @@ def fetch_jobs_from_cake_web() -> list[dict[str, Any]]:
                 page=page,
                 search_tmpl=search_tmpl,
             )
-            resp = requests.get(url, headers=headers, timeout=timeout)
+            resp = _SESSION.get(url, headers=headers, timeout=timeout)
             resp.raise_for_status()
             html = resp.text
             page_jobs = _extract_cake_jobs_from_json_ld(html, base_url)
@@ -1108,7 +1679,7 @@ def fetch_jobs_from_yourator_web() -> list[dict[str, Any]]:
 
     for keyword in keywords:
         for page in range(1, max(1, pages) + 1):
-            resp = requests.get(
+            resp = _SESSION.get(
                 api_url,
                 params={"term": keyword, "page": page},
                 headers=headers,
@@ -1206,8 +1777,10 @@ def fetch_jobs_from_imap() -> list[dict[str, Any]]:
         client.logout()
         raise RuntimeError("IMAP 查詢失敗")
 
+    # The network FETCH stays serial on the single IMAP connection; the
+    # CPU-bound decode/parse of each message is farmed out to a pool.
     ids = ids_data[0].split()
-    jobs: list[dict[str, Any]] = []
+    raw_messages: list[bytes] = []
     for msg_id in ids:
         status, msg_data = client.fetch(msg_id, "(RFC822)")
         if status != "OK" or not msg_data or not msg_data[0]:
@@ -1215,44 +1788,54 @@ def fetch_jobs_from_imap() -> list[dict[str, Any]]:
         raw = msg_data[0][1]
         if not isinstance(raw, (bytes, bytearray)):
             continue
-        msg = email.message_from_bytes(raw)
+        raw_messages.append(bytes(raw))
+    client.logout()
+
+    def parse_message(raw: bytes) -> list[dict[str, Any]]:
+        msg = email.message_from_bytes(raw, policy=email.policy.default)
         from_text = decode_mime_words(msg.get("From"))
         subject = decode_mime_words(msg.get("Subject"))
         if from_filter and from_filter.lower() not in from_text.lower():
-            continue
+            return []
         if subject_filter and subject_filter.lower() not in subject.lower():
-            continue
+            return []
         plain_text, html_text = extract_email_bodies(msg)
-        jobs.extend(extract_jobs_from_email(subject, plain_text, html_text))
-    client.logout()
+        return extract_jobs_from_email(subject, plain_text, html_text)
+
+    jobs: list[dict[str, Any]] = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        for parsed in executor.map(parse_message, raw_messages):
+            jobs.extend(parsed)
     return jobs
 
 
-def render_markdown(matched: list[dict[str, Any]], date_str: str) -> str:
+def render_markdown(matched: list[dict[str, Any]], date_str: str, out: Any) -> None:
+    """Write the markdown report to ``out`` job by job.
+
+    Streaming into the (buffered) file handle keeps peak memory at the
+    buffer size instead of holding the whole document as one string.
+    """
+    write = out.write
     source_labels = sorted({str(item.get("source", "")).strip() for item in matched if item.get("source")})
     source_text = " / ".join(source_labels) if source_labels else "未知來源"
-    lines = [
-        f"# 每日職缺清單 ({date_str})",
-        "",
-        f"來源: {source_text}",
-        "使用限制: 僅供個人求職整理，不對外提供 API 或下載。",
-        "",
-    ]
+    write(f"# 每日職缺清單 ({date_str})\n\n")
+    write(f"來源: {source_text}\n")
+    write("使用限制: 僅供個人求職整理，不對外提供 API 或下載。\n\n")
     if not matched:
-        lines.append("今天沒有符合條件的職缺。")
-        return "\n".join(lines)
+        write("今天沒有符合條件的職缺。")
+        return
 
     for i, m in enumerate(matched, 1):
-        lines.append(f"## {i}. {m['title']} - {m['company']}")
-        lines.append(f"- 地點: {m['city'] or '未提供'}")
+        if i > 1:
+            write("\n")
+        write(f"## {i}. {m['title']} - {m['company']}\n")
+        write(f"- 地點: {m['city'] or '未提供'}\n")
         salary_text = "面議" if _coerce_int(m.get("salary", 0)) <= 0 else str(m.get("salary", 0))
-        lines.append(f"- 薪資下限: {salary_text}")
-        lines.append(f"- 分數: {m['score']}")
-        lines.append(f"- 理由: {'; '.join(m['reasons'])}")
+        write(f"- 薪資下限: {salary_text}\n")
+        write(f"- 分數: {m['score']}\n")
+        write(f"- 理由: {'; '.join(m['reasons'])}\n")
         if m["url"]:
-            lines.append(f"- 連結: {m['url']}")
-        lines.append("")
-    return "\n".join(lines).strip() + "\n"
+            write(f"- 連結: {m['url']}\n")
 
 
 def build_line_text(matched: list[dict[str, Any]], date_str: str) -> str:
@@ -1295,9 +1878,46 @@ def minimize_job_output(job: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+class _MinimizedJobView:
+    """Defers minimize_job_output until the JSON encoder reaches the job.
+
+    Wrapping instead of materializing a second list of minimized dicts lets
+    json.dump stream the projection one job at a time.
+    """
+
+    __slots__ = ("job",)
+
+    def __init__(self, job: dict[str, Any]) -> None:
+        self.job = job
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, _MinimizedJobView):
+        return minimize_job_output(obj.job)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 def canonical_job_key(job: dict[str, Any]) -> str:
-    source = str(job.get("source", "")).strip().lower() or "unknown"
-    url = str(job.get("url", "")).strip()
+    # Called from the in-run dedup, the historical dedup and the seen-file
+    # update; cache the computed key on the dict so later calls are O(1).
+    key = job.get("_canonical_key")
+    if key is None:
+        key = _compute_canonical_job_key(
+            str(job.get("source", "")),
+            str(job.get("url", "")),
+            str(job.get("title", "")),
+            str(job.get("company", "")),
+        )
+        job["_canonical_key"] = key
+    return key
+
+
+@functools.lru_cache(maxsize=4096)
+def _compute_canonical_job_key(source: str, url: str, title: str, company: str) -> str:
+    # Memoized on the raw field strings: the same listing reappearing across
+    # fetch pages or sources skips the URL parse entirely.
+    source = source.strip().lower() or "unknown"
+    url = url.strip()
     if url:
         parsed = urlparse(url)
         host = parsed.netloc.lower()
@@ -1315,8 +1935,8 @@ def canonical_job_key(job: dict[str, Any]) -> str:
         normalized_url = f"{host}{path}".rstrip("/")
         if normalized_url:
             return f"{source}::{normalized_url}"
-    title = str(job.get("title", "")).strip().lower()
-    company = str(job.get("company", "")).strip().lower()
+    title = title.strip().lower()
+    company = company.strip().lower()
     return f"{source}::{title}::{company}"
 
 
@@ -1355,14 +1975,26 @@ def _semantic_city_key(job: dict[str, Any]) -> str:
 
 
 def dedup_by_company_title_with_city_assist(
-    jobs: list[dict[str, Any]], *, keep_order: bool = True
+    jobs: Iterable[dict[str, Any]],
+    *,
+    keep_order: bool = True,
+    limit: int | None = None,
 ) -> list[dict[str, Any]]:
+    """Drop same-company/title duplicates, keeping first occurrences.
+
+    With ``limit`` the scan stops as soon as that many jobs are kept, so a
+    ranked (or lazily ranked) input only pays for the prefix it needs.
+    """
     kept: list[dict[str, Any]] = []
     buckets: dict[str, list[dict[str, Any]]] = {}
+    if limit is not None and limit <= 0:
+        return kept
     for job in jobs:
         base_key = _semantic_company_title_key(job)
         if base_key == "::":
             kept.append(job)
+            if limit is not None and len(kept) >= limit:
+                break
             continue
         city_key = _semantic_city_key(job)
         candidates = buckets.get(base_key, [])
@@ -1380,6 +2012,8 @@ def dedup_by_company_title_with_city_assist(
             continue
         buckets.setdefault(base_key, []).append(job)
         kept.append(job)
+        if limit is not None and len(kept) >= limit:
+            break
     if keep_order:
         return kept
     return list(kept)
@@ -1424,21 +2058,64 @@ def load_source_matched_jobs_for_date(output_dir: Path, date_str: str) -> tuple[
     return total_candidates, merged_jobs
 
 
-def load_seen_job_keys(path: Path) -> set[str]:
+def seen_key_digest(key: str | bytes) -> int:
+    # 64-bit digest; collisions are negligible at this file's scale and the
+    # int set costs a fraction of the memory of the full URL strings.
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big")
+
+
+def load_seen_job_keys(path: Path) -> set[int]:
+    """Load the historical seen keys as a set of 64-bit digests.
+
+    The file keeps full keys (one per line) for debuggability; only the
+    in-memory representation is hashed.
+    """
     if not path.exists():
         return set()
-    keys = {
-        line.strip()
-        for line in path.read_text(encoding="utf-8").splitlines()
-        if line.strip()
-    }
-    return keys
+    # mmap lets the page cache back the read directly instead of copying
+    # through a read() buffer first.
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # zero-length file
+            return set()
+        with mm:
+            lines = [
+                stripped
+                for line in bytes(mm).splitlines()
+                if (stripped := line.strip())
+            ]
+    digests = {seen_key_digest(line) for line in lines}
+    # The log is append-only; interrupted or overlapping runs can leave
+    # duplicate lines behind. Compact once duplicates dominate the file.
+    if len(lines) > 2 * len(digests):
+        path.write_bytes(b"\n".join(sorted(set(lines))) + b"\n")
+    return digests
+
+
+def _open600(path: Path) -> Any:
+    """Open a report file for writing with mode 0600 applied at creation.
+
+    Creating the file with the final mode avoids the window where a
+    write_text-then-chmod sequence leaves it world-readable, and saves the
+    extra chmod syscall.
+    """
+    fd = os.open(
+        str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o600
+    )
+    return os.fdopen(fd, "wb", buffering=1 << 16)
 
 
-def save_seen_job_keys(path: Path, keys: set[str]) -> None:
+def append_seen_job_keys(path: Path, new_keys: set[str]) -> None:
+    # Append-only: only this run's delta hits the disk; load_seen_job_keys
+    # dedupes on read, so rewriting the whole history every run is wasted I/O.
+    if not new_keys:
+        return
     path.parent.mkdir(parents=True, exist_ok=True)
-    content = "\n".join(sorted(keys)) + ("\n" if keys else "")
-    path.write_text(content, encoding="utf-8")
+    with path.open("a", encoding="utf-8") as f:
+        f.write("\n".join(sorted(new_keys)) + "\n")
 
 
 def push_line_message(text: str) -> tuple[bool, str]:
@@ -1458,8 +2135,9 @@ def push_line_message(text: str) -> tuple[bool, str]:
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json",
     }
-    # Validate token first for clearer error.
-    info_resp = requests.get(
+    # Validate token first for clearer error. Reusing the shared session
+    # also means the push below skips a second TLS handshake.
+    info_resp = _SESSION.get(
         "https://api.line.me/v2/bot/info", headers=headers, timeout=timeout
     )
     if info_resp.status_code != 200:
@@ -1471,13 +2149,13 @@ def push_line_message(text: str) -> tuple[bool, str]:
         "to": to_user_id,
         "messages": [{"type": "text", "text": text}],
     }
-    resp = requests.post(endpoint, headers=headers, json=payload, timeout=timeout)
+    resp = _SESSION.post(endpoint, headers=headers, json=payload, timeout=timeout)
     if resp.status_code >= 400:
         return False, f"失敗：LINE push 回應 status={resp.status_code}"
     return True, "成功：LINE 推播已送出"
 
 
-def append_google_sheet_rows(matched: list[dict[str, Any]], date_str: str) -> bool:
+def append_google_sheet_rows(matched: Iterable[dict[str, Any]], date_str: str) -> bool:
     credentials_file = os.getenv("GOOGLE_SHEETS_CREDENTIALS_FILE", "").strip()
     spreadsheet_id = os.getenv("GOOGLE_SHEETS_SPREADSHEET_ID", "").strip()
     worksheet_name = os.getenv("GOOGLE_SHEETS_WORKSHEET", "jobs").strip()
@@ -1643,7 +2321,14 @@ def append_google_sheet_rows(matched: list[dict[str, Any]], date_str: str) -> bo
     # append_rows uses the Sheets append API (insert rows). Manually calling add_rows
     # beforehand can create duplicated blank rows (e.g., +10 blank then +10 inserted rows).
     # Rely on append_rows to handle row growth.
-    worksheet.append_rows(rows, value_input_option="USER_ENTERED")
+    # All rows go out in ONE values.append request. Never loop append_row per
+    # job here: the write-requests-per-minute quota (60/user) would throttle
+    # runs with more than a handful of matches.
+    worksheet.append_rows(
+        rows,
+        value_input_option="USER_ENTERED",
+        insert_data_option="INSERT_ROWS",
+    )
     return True
 
 
@@ -1674,6 +2359,11 @@ def main() -> None:
     parser.add_argument(
         "--no-google-sheet", action="store_true", help="只輸出檔案，不寫入 Google Sheet"
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="JSON 輸出使用 indent=2（預設為緊湊格式，編碼較快、檔案較小）",
+    )
     parser.add_argument(
         "--merge-top-n",
         type=int,
@@ -1710,18 +2400,34 @@ def main() -> None:
         }.get(args.source, "seen_job_keys.txt")
         seen_file = output_dir / default_seen_name
 
+    # Kick off the seen-file read now so the disk I/O (and a possible
+    # compaction rewrite) overlaps the fetch/parse work below. With
+    # --ignore-seen-dedup the file is never touched.
+    seen_future = None
+    if not args.ignore_seen_dedup:
+        seen_loader = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        seen_future = seen_loader.submit(load_seen_job_keys, seen_file)
+        seen_loader.shutdown(wait=False)
+
+    historical_seen_keys: set[int] = set()
     if args.source == "merge":
         total_candidates, merged_input_jobs = load_source_matched_jobs_for_date(output_dir, date_str)
         matched = dedup_cross_platform_jobs(merged_input_jobs)
-        historical_seen_keys = set()
-        if not args.ignore_seen_dedup:
-            historical_seen_keys = load_seen_job_keys(seen_file)
-            matched = [job for job in matched if cross_platform_job_key(job) not in historical_seen_keys]
-        matched.sort(key=_job_sort_key, reverse=True)
-        matched = matched[: max(0, args.merge_top_n)]
+        if seen_future is not None:
+            historical_seen_keys = seen_future.result()
+            matched = [
+                job
+                for job in matched
+                if seen_key_digest(cross_platform_job_key(job))
+                not in historical_seen_keys
+            ]
+        # Bounded selection: only the top merge_top_n jobs survive, so an
+        # O(N log K) partial sort beats fully ordering the candidate list.
+        matched = heapq.nlargest(max(0, args.merge_top_n), matched, key=_job_sort_key)
     else:
         rules_path = Path(args.rules) if args.rules else Path(default_rules_name)
         rules = load_rules(rules_path)
+        scorer = compile_scorer(rules)
         if args.source == "web104":
             raw_jobs = fetch_jobs_from_104_web()
             jobs = [normalize_job(j, source="104") for j in raw_jobs]
@@ -1740,80 +2446,154 @@ def main() -> None:
             raw_jobs = fetch_jobs()
             jobs = [normalize_job(j, source="api") for j in raw_jobs]
 
-        # Remove duplicates in the same run.
-        deduped_jobs: list[dict[str, Any]] = []
-        run_seen_keys: dict[str, int] = {}
+        # Remove duplicates in the same run. A plain dict comprehension would
+        # drop the order-merge for repeated 104 listings, so keep-first plus
+        # merge runs through one insertion-ordered dict.
+        by_key: dict[str, dict[str, Any]] = {}
         for job in jobs:
-            key = canonical_job_key(job)
-            if key in run_seen_keys:
-                _merge_web104_orders(deduped_jobs[run_seen_keys[key]], job)
-                continue
-            run_seen_keys[key] = len(deduped_jobs)
-            deduped_jobs.append(job)
-        jobs = deduped_jobs
+            existing = by_key.setdefault(canonical_job_key(job), job)
+            if existing is not job:
+                _merge_web104_orders(existing, job)
+        jobs = list(by_key.values())
 
         # Remove jobs that were already surfaced in previous runs.
-        historical_seen_keys = set()
-        if not args.ignore_seen_dedup:
-            historical_seen_keys = load_seen_job_keys(seen_file)
-            jobs = [job for job in jobs if canonical_job_key(job) not in historical_seen_keys]
-
-        matched = []
-        for job in jobs:
-            score, reasons = score_job(job, rules)
-            if score < rules.minimum_score:
+        if seen_future is not None:
+            historical_seen_keys = seen_future.result()
+            jobs = [
+                job
+                for job in jobs
+                if seen_key_digest(canonical_job_key(job)) not in historical_seen_keys
+            ]
+
+        # Cheap scalar filters first: jobs failing city / company checks
+        # never reach the keyword and fuzzy scans below.
+        jobs = [job for job in jobs if cheap_disqualify_reason(job, rules) is None]
+
+        # Decorate-sort: keep scores/reasons in parallel tuples instead of
+        # writing them into every job dict, most of which get discarded by
+        # the minimum-score cut and the top_n slice anyway.
+        scored: list[tuple[int, int, dict[str, Any], list[str]]] = []
+        # Locals for the loop: LOAD_FAST per job instead of attribute lookups.
+        min_score = rules.minimum_score
+        extract_orders = _extract_web104_orders
+        keep = scored.append
+        for job, (score, reasons) in zip(jobs, score_jobs(jobs, rules, scorer)):
+            if score < min_score:
                 continue
-            job["score"] = score
-            job["reasons"] = reasons
-            matched.append(job)
-
-        matched.sort(
-            key=lambda x: (
-                x.get("score", 0),
-                1 if 16 in _extract_web104_orders(x) else 0,
-            ),
-            reverse=True,
+            order_boost = 1 if 16 in extract_orders(job) else 0
+            keep((score, order_boost, job, reasons))
+        _FUZZY_CACHE.clear()
+
+        # Lazily rank with a heap instead of fully sorting: dedup stops once
+        # top_n jobs are kept, so only that prefix of the ranking is popped.
+        heap = [
+            (-score, -boost, idx) for idx, (score, boost, _, _) in enumerate(scored)
+        ]
+        heapq.heapify(heap)
+
+        def ranked_jobs() -> Iterator[dict[str, Any]]:
+            while heap:
+                yield scored[heapq.heappop(heap)[2]][2]
+
+        decoration = {id(job): (score, reasons) for score, _, job, reasons in scored}
+        kept = dedup_by_company_title_with_city_assist(
+            ranked_jobs(), limit=rules.top_n
         )
-        matched = dedup_by_company_title_with_city_assist(matched)
-        matched = matched[: rules.top_n]
+        matched = []
+        for job in kept:
+            score, reasons = decoration[id(job)]
+            matched.append(dict(job, score=score, reasons=reasons))
         total_candidates = len(raw_jobs)
 
-    md_content = render_markdown(matched, date_str)
-    minimized_jobs = [minimize_job_output(job) for job in matched]
     json_output = {
         "date": date_str,
         "source": args.source,
         "usage_notice": "僅供個人求職整理，不對外提供 API 或下載。",
         "total_candidates": total_candidates,
-        "matched_count": len(minimized_jobs),
-        "matched_jobs": minimized_jobs,
+        "matched_count": len(matched),
+        "matched_jobs": [_MinimizedJobView(job) for job in matched],
     }
 
     md_path = output_dir / f"{source_file_prefix}_{date_str}.md"
     json_path = output_dir / f"{source_file_prefix}_{date_str}.json"
-    md_path.write_text(md_content, encoding="utf-8")
-    json_path.write_text(
-        json.dumps(json_output, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
-    os.chmod(md_path, 0o600)
-    os.chmod(json_path, 0o600)
 
-    new_seen_keys = set(historical_seen_keys)
-    for job in minimized_jobs:
+    # LINE push and the Sheets append are independent blocking network calls;
+    # run them on worker threads so their latency overlaps the local writes.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        line_future = None
+        if not args.no_line_push:
+            line_future = pool.submit(
+                push_line_message, build_line_text(matched, date_str)
+            )
+        sheet_future = None
+        if not args.no_google_sheet:
+            sheet_future = pool.submit(
+                append_google_sheet_rows,
+                (minimize_job_output(job) for job in matched),
+                date_str,
+            )
+
+        with io.TextIOWrapper(_open600(md_path), encoding="utf-8") as fp:
+            render_markdown(matched, date_str, fp)
+        # json.dump streams into the file buffer instead of materializing the
+        # whole serialized payload as one string first.
+        # Compact by default: indent kicks the stdlib encoder off its C fast
+        # path and roughly doubles the output size.
+        if _orjson is not None:
+            # orjson's UTF-8 encoder is several times faster than stdlib on
+            # the Chinese-heavy payload; it returns the whole document as
+            # bytes, which at top_n scale is fine.
+            with _open600(json_path) as fp:
+                fp.write(
+                    _orjson.dumps(
+                        json_output,
+                        option=_orjson.OPT_INDENT_2 if args.pretty else 0,
+                        default=_json_default,
+                    )
+                )
+        else:
+            with io.TextIOWrapper(_open600(json_path), encoding="utf-8") as fp:
+                if args.pretty:
+                    json.dump(
+                        json_output,
+                        fp,
+                        ensure_ascii=False,
+                        indent=2,
+                        default=_json_default,
+                    )
+                else:
+                    json.dump(
+                        json_output,
+                        fp,
+                        ensure_ascii=False,
+                        separators=(",", ":"),
+                        default=_json_default,
+                    )
+
+        # Set comprehensions build the key set in one C-level pass instead of
+        # a bytecode .add per job.
         if args.source == "merge":
-            new_seen_keys.add(cross_platform_job_key(job))
+            run_seen_keys_out = {cross_platform_job_key(job) for job in matched}
         else:
-            new_seen_keys.add(canonical_job_key(job))
-    save_seen_job_keys(seen_file, new_seen_keys)
-
-    print(f"完成: {md_path}")
-    print(f"完成: {json_path}")
-    if not args.no_line_push:
-        line_text = build_line_text(matched, date_str)
-        ok, msg = push_line_message(line_text)
-        print(f"LINE 推播: {msg}")
-    if not args.no_google_sheet and append_google_sheet_rows(minimized_jobs, date_str):
-        print("Google Sheet: 已嘗試寫入（若未設定 credentials/sheet id 則自動略過）")
+            # matched still carries the key cached during in-run dedup; keying
+            # off the minimized copies would recompute every URL parse.
+            run_seen_keys_out = {canonical_job_key(job) for job in matched}
+        append_seen_job_keys(
+            seen_file,
+            {
+                key
+                for key in run_seen_keys_out
+                if seen_key_digest(key) not in historical_seen_keys
+            },
+        )
+
+        print(f"完成: {md_path}")
+        print(f"完成: {json_path}")
+        if line_future is not None:
+            ok, msg = line_future.result()
+            print(f"LINE 推播: {msg}")
+        if sheet_future is not None and sheet_future.result():
+            print("Google Sheet: 已嘗試寫入（若未設定 credentials/sheet id 則自動略過）")
 
 
 if __name__ == "__main__":